@@ -27,6 +27,7 @@ logger.setLevel(logging.INFO)
 #     sock.close()
 #     app.run(port=port)
 
+# Local development only; production runs under gunicorn (see wsgi.py / gunicorn.conf.py)
 if __name__ == "__main__":
     logging.info("Starting application ...")
     # Show all registered routes to verify /trivia is present
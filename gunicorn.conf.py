@@ -0,0 +1,11 @@
+import multiprocessing
+import os
+
+# Picked up automatically by `gunicorn wsgi:application` from the working directory.
+bind = "0.0.0.0:{}".format(os.environ.get("PORT", "8080"))
+workers = int(os.environ.get("WEB_CONCURRENCY", multiprocessing.cpu_count() * 2 + 1))
+worker_class = "gthread"
+threads = 4
+
+# Import the app (and compile the Numba kernels) once in the master, then fork
+preload_app = True
@@ -1,6 +1,47 @@
+import json
+import re
+
+import orjson
 from flask import Flask
+from flask.json.provider import JSONProvider
+
+# orjson only holds integers in the 64-bit range: bigger ones fail to dump and
+# silently load as floats. A run of 19+ digits may be one, so use stdlib json.
+_LONG_DIGITS = re.compile(rb"\d{19}")
+
+
+def _stdlib_default(obj):
+    # NumPy scalars/arrays (orjson's OPT_SERIALIZE_NUMPY) in the stdlib fallback
+    if hasattr(obj, "tolist"):
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class OrjsonProvider(JSONProvider):
+    """JSON provider backed by orjson; keeps Flask's sorted-key output and
+    falls back to stdlib json for integers outside the 64-bit range."""
+
+    option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_SORT_KEYS
+
+    def dumps(self, obj, **kwargs):
+        return self.dumps_bytes(obj).decode()
+
+    def dumps_bytes(self, obj):
+        """Like dumps, but return UTF-8 bytes for building a response body directly."""
+        try:
+            return orjson.dumps(obj, option=self.option)
+        except TypeError:
+            return json.dumps(obj, sort_keys=True, separators=(",", ":"),
+                              default=_stdlib_default).encode()
+
+    def loads(self, s, **kwargs):
+        if _LONG_DIGITS.search(s.encode() if isinstance(s, str) else s):
+            return json.loads(s)
+        return orjson.loads(s)
+
 
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 from routes import square
 from routes import trivia
 from routes import ticketing
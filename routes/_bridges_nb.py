@@ -0,0 +1,58 @@
+"""Numba Tarjan bridge finder over CSR adjacency, used by spy_net."""
+import numpy as np
+from numba import njit
+
+
+@njit("boolean[::1](int64[::1], int64[::1], int64[::1], int64, int64)", cache=True)
+def find_bridges(indptr, neighbor, edge_id, n, m):
+    """Return bridges[m]: True for edges whose removal disconnects the graph."""
+    tin = np.full(n, -1, np.int64)
+    low = np.zeros(n, np.int64)
+    bridges = np.zeros(m, np.bool_)
+    # explicit DFS stack: node, edge used to reach it, next CSR slot to scan
+    stack_u = np.empty(n, np.int64)
+    stack_pe = np.empty(n, np.int64)
+    stack_it = np.empty(n, np.int64)
+    timer = 0
+
+    for root in range(n):
+        if tin[root] != -1:
+            continue
+        tin[root] = timer
+        low[root] = timer
+        timer += 1
+        top = 0
+        stack_u[0] = root
+        stack_pe[0] = -1
+        stack_it[0] = indptr[root]
+        while top >= 0:
+            u = stack_u[top]
+            k = stack_it[top]
+            if k == indptr[u + 1]:
+                # u is finished: propagate low to its parent
+                top -= 1
+                if top >= 0:
+                    pu = stack_u[top]
+                    if low[u] < low[pu]:
+                        low[pu] = low[u]
+                    if low[u] > tin[pu]:
+                        bridges[stack_pe[top + 1]] = True
+                continue
+            stack_it[top] = k + 1
+            ei = edge_id[k]
+            if ei == stack_pe[top]:
+                continue
+            v = neighbor[k]
+            if tin[v] != -1:
+                # back edge
+                if tin[v] < low[u]:
+                    low[u] = tin[v]
+            else:
+                tin[v] = timer
+                low[v] = timer
+                timer += 1
+                top += 1
+                stack_u[top] = v
+                stack_pe[top] = ei
+                stack_it[top] = indptr[v]
+    return bridges
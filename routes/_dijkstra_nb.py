@@ -0,0 +1,62 @@
+"""Numba Dijkstra over CSR arrays, used by princess_diaries when SciPy is missing."""
+import numpy as np
+from numba import njit
+
+
+@njit("void(int64[::1], int64[::1], float64[::1], int64, int64, float64[::1])", cache=True)
+def dijkstra_csr(indptr, indices, weights, src, n, dist):
+    """Fill dist[0..n) with shortest distances from src (np.inf if unreachable)."""
+    for i in range(n):
+        dist[i] = np.inf
+    # lazy-deletion binary heap; every push is a strict improvement along one
+    # CSR entry, so it never holds more than nnz + 1 items
+    cap = indices.shape[0] + 1
+    heap_d = np.empty(cap, np.float64)
+    heap_v = np.empty(cap, np.int64)
+    heap_d[0] = 0.0
+    heap_v[0] = src
+    size = 1
+    dist[src] = 0.0
+
+    while size > 0:
+        d = heap_d[0]
+        u = heap_v[0]
+        size -= 1
+        if size > 0:
+            # move the last item to the root and sift it down
+            ld = heap_d[size]
+            lv = heap_v[size]
+            i = 0
+            while True:
+                c = 2 * i + 1
+                if c >= size:
+                    break
+                if c + 1 < size and heap_d[c + 1] < heap_d[c]:
+                    c += 1
+                if heap_d[c] >= ld:
+                    break
+                heap_d[i] = heap_d[c]
+                heap_v[i] = heap_v[c]
+                i = c
+            heap_d[i] = ld
+            heap_v[i] = lv
+
+        if d > dist[u]:
+            continue
+        for k in range(indptr[u], indptr[u + 1]):
+            v = indices[k]
+            nd = d + weights[k]
+            if nd < dist[v]:
+                dist[v] = nd
+                # push (nd, v) and sift it up
+                i = size
+                size += 1
+                while i > 0:
+                    p = (i - 1) >> 1
+                    if heap_d[p] <= nd:
+                        break
+                    heap_d[i] = heap_d[p]
+                    heap_v[i] = heap_v[p]
+                    i = p
+                heap_d[i] = nd
+                heap_v[i] = v
@@ -0,0 +1,44 @@
+"""Numba weighted-interval-scheduling DP, used by princess_diaries."""
+import numpy as np
+from numba import njit
+
+
+@njit("Tuple((int64[::1], int64[::1], int64[::1], int8[::1]))"
+      "(int64[::1], int64[::1], int64[::1], int64, float64[:, ::1], int64)", cache=True)
+def wis_dp(p, scores, station_row, s0_col, D, n):
+    """Return (dp_score, dp_fee, last_idx, choice); see solve_princess_diaries for the recurrence."""
+    dp_score = np.zeros(n + 1, np.int64)
+    dp_fee = np.zeros(n + 1, np.int64)
+    last_idx = np.full(n + 1, -1, np.int64)
+    choice = np.zeros(n + 1, np.int8)
+
+    for i in range(1, n + 1):
+        # Option A: skip i
+        best_score = dp_score[i - 1]
+        best_fee = dp_fee[i - 1]
+        best_last = last_idx[i - 1]
+        best_choice = 0
+
+        # Option B: take i after the schedule represented by dp[p[i]]
+        j = p[i]
+        prev_last = last_idx[j]
+        take_score = dp_score[j] + scores[i - 1]
+        si = station_row[i - 1]
+        if prev_last == -1:
+            take_fee = np.int64(D[s0_col, si] + D[si, s0_col])
+        else:
+            slast = station_row[prev_last - 1]
+            take_fee = dp_fee[j] + np.int64(D[slast, si] + D[si, s0_col] - D[slast, s0_col])
+
+        # maximize score, then minimize fee
+        if take_score > best_score or (take_score == best_score and take_fee < best_fee):
+            best_score = take_score
+            best_fee = take_fee
+            best_last = i
+            best_choice = 1
+
+        dp_score[i] = best_score
+        dp_fee[i] = best_fee
+        last_idx[i] = best_last
+        choice[i] = best_choice
+    return dp_score, dp_fee, last_idx, choice
@@ -1,42 +1,89 @@
-from bisect import bisect_right
-from collections import defaultdict
-import heapq
+import hashlib
+import json
+import numpy as np
 from flask import request, jsonify
 from routes import app  # uses the shared Flask app created in routes/__init__.py
+from routes._lru import LRUCache, memoize_response
+from routes._wis_nb import wis_dp
+
+try:
+    from scipy.sparse import csr_matrix
+    from scipy.sparse.csgraph import dijkstra
+except ImportError:  # no SciPy: fall back to the Numba kernel (Numba is always required)
+    csr_matrix = None
+    from routes._dijkstra_nb import dijkstra_csr
 
 
 # ---------- Shortest paths (on needed stations only) ----------
-def build_graph(subway):
-    g = defaultdict(list)
+def build_graph(subway, stations=()):
+    """Return ((indptr, indices, weights), id_of): undirected CSR adjacency and station -> node id."""
+    id_of = {}
+    rows, cols, data = [], [], []
     for edge in subway:
         u, v = edge["connection"]
-        w = int(edge["fee"])
-        # if multiple edges exist, keep all; Dijkstra will handle via min path
-        g[u].append((v, w))
-        g[v].append((u, w))
-    return g
-
-def dijkstra(start, graph):
-    dist = {}
-    pq = [(0, start)]
-    dist[start] = 0
-    while pq:
-        d, u = heapq.heappop(pq)
-        if d != dist[u]:
-            continue
-        for v, w in graph.get(u, []):
-            nd = d + w
-            if v not in dist or nd < dist[v]:
-                dist[v] = nd
-                heapq.heappush(pq, (nd, v))
-    return dist
-
-def all_pairs_needed_dists(needed_stations, graph):
-    """Return distances[u][v] for u in needed_stations to all v (dict of dict)."""
-    distances = {}
-    for u in needed_stations:
-        distances[u] = dijkstra(u, graph)
-    return distances
+        u = id_of.setdefault(int(u), len(id_of))
+        v = id_of.setdefault(int(v), len(id_of))
+        rows.append(u)
+        cols.append(v)
+        data.append(int(edge["fee"]))
+    # stations with no subway edges still need a node (distance 0 to themselves)
+    for s in stations:
+        id_of.setdefault(s, len(id_of))
+
+    n = len(id_of)
+    row = np.array(rows + cols, dtype=np.int64)
+    col = np.array(cols + rows, dtype=np.int64)
+    w = np.array(data + data, dtype=np.float64)
+    # keep only the cheapest of any parallel edges (csr_matrix would sum them)
+    order = np.lexsort((w, col, row))
+    row, col, w = row[order], col[order], w[order]
+    first = np.ones(len(row), dtype=bool)
+    first[1:] = (row[1:] != row[:-1]) | (col[1:] != col[:-1])
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(row[first], minlength=n), out=indptr[1:])
+    return (indptr, col[first], w[first]), id_of
+
+def all_pairs_needed_dists(needed_stations, graph, id_of):
+    """Return (D, station_to_row): D[station_to_row[u], id_of[v]] is d(u, v)."""
+    indptr, indices, weights = graph
+    n = len(indptr) - 1
+    needed = list(needed_stations)
+    station_to_row = {u: r for r, u in enumerate(needed)}
+    sources = np.array([id_of[u] for u in needed], dtype=np.int64)
+    if csr_matrix is not None:
+        csr = csr_matrix((weights, indices, indptr), shape=(n, n))
+        D = dijkstra(csr, directed=False, indices=sources)
+    else:
+        D = np.empty((len(sources), n), dtype=np.float64)
+        for r, src in enumerate(sources):
+            dijkstra_csr(indptr, indices, weights, src, n, D[r])
+    return D, station_to_row
+
+# Repeated subways skip graph building and Dijkstra entirely
+_GRAPH_CACHE = LRUCache(32)  # subway_key -> (graph, id_of)
+_DIST_CACHE = LRUCache(32)   # (subway_key, frozenset(stations)) -> (D, station_to_row)
+
+def cached_needed_dists(subway, stations_needed):
+    """Memoized build_graph + all_pairs_needed_dists, cut down to the needed stations.
+
+    Returns (D, station_to_row) with D[station_to_row[u], station_to_row[v]] == d(u, v).
+    """
+    subway_key = hashlib.blake2b(json.dumps(subway, sort_keys=True).encode()).digest()
+    dist_key = (subway_key, frozenset(stations_needed))
+    cached = _DIST_CACHE.get(dist_key)
+    if cached is None:
+        built = _GRAPH_CACHE.get(subway_key)
+        if built is None or not stations_needed <= built[1].keys():
+            built = build_graph(subway, stations_needed)
+            _GRAPH_CACHE.put(subway_key, built)
+        graph, id_of = built
+        D, station_to_row = all_pairs_needed_dists(stations_needed, graph, id_of)
+        D = np.ascontiguousarray(D[:, [id_of[u] for u in station_to_row]])
+        if not np.isfinite(D).all():
+            raise ValueError("subway does not connect all task stations")
+        cached = (D, station_to_row)
+        _DIST_CACHE.put(dist_key, cached)
+    return cached
 
 
 # ---------- Core solver ----------
@@ -62,75 +109,30 @@ def solve_princess_diaries(payload):
         stations_needed.add(station)
 
     # Build graph & all needed shortest paths
-    graph = build_graph(subway)
-    distances = all_pairs_needed_dists(stations_needed, graph)
-
-    # Helper to get d(u,v) safely (graph is connected as per problem)
-    def d(u, v):
-        if u == v:
-            return 0
-        return distances[u][v]
+    D, station_to_row = cached_needed_dists(subway, stations_needed)
 
     # Weighted interval scheduling setup
     # Sort tasks by end time (stable tie-breakers: then by start, then by name)
     tasks.sort(key=lambda x: (x["end"], x["start"], x["name"]))
     n = len(tasks)
 
-    # Precompute p[i]: index j (1..n) of the last task that finishes <= start_i; 0 if none
-    ends = [tasks[i]["end"] for i in range(n)]
-    p = [0] * (n + 1)  # 1-based
-    for i in range(1, n + 1):
-        start_i = tasks[i - 1]["start"]
-        # rightmost end <= start_i
-        j = bisect_right(ends, start_i) - 1
-        p[i] = 0 if j < 0 else (j + 1)
-
-    # DP arrays (1-based for tasks; 0 = empty schedule)
-    # We store total fee INCLUDING return to s0, so tie-breaking is correct locally
-    dp_score = [0] * (n + 1)
-    dp_fee   = [0] * (n + 1)        # total fee including return to s0
-    last_idx = [-1] * (n + 1)       # last selected task index for the dp state
-    choice   = [0] * (n + 1)        # 0 = skip i, 1 = take i
-
-    # For reconstruction when we take i, remember predecessor index (p[i])
-    # Not strictly necessary but makes backtracking trivial.
-    for i in range(1, n + 1):
-        # Option A: skip i
-        best_score = dp_score[i - 1]
-        best_fee   = dp_fee[i - 1]
-        best_last  = last_idx[i - 1]
-        best_choice = 0  # skip
-
-        # Option B: take i
-        j = p[i]
-        prev_score = dp_score[j]
-        prev_fee   = dp_fee[j]
-        prev_last  = last_idx[j]
-
-        take_score = prev_score + tasks[i - 1]["score"]
-
-        # Compute fee if we append task i after the schedule represented by dp[j]
-        si = tasks[i - 1]["station"]
-
-        if prev_last == -1:
-            # First task in the schedule
-            take_fee = d(s0, si) + d(si, s0)
-        else:
-            slast = tasks[prev_last - 1]["station"]
-            # Remove old return slast->s0, add slast->si and si->s0
-            take_fee = prev_fee - d(slast, s0) + d(slast, si) + d(si, s0)
-
-        # Choose lexicographically: maximize score, then minimize fee
-        if (take_score > best_score) or (take_score == best_score and take_fee < best_fee):
-            best_score = take_score
-            best_fee   = take_fee
-            best_last  = i
-            best_choice = 1  # take
-
-        dp_score[i] = best_score
-        dp_fee[i]   = best_fee
-        last_idx[i] = best_last
-        choice[i]   = best_choice
+    # Row/col of every task station in D (graph is connected as per problem)
+    station_row = np.array([station_to_row[t["station"]] for t in tasks], dtype=np.int64)
+    scores = np.fromiter((t["score"] for t in tasks), dtype=np.int64, count=n)
+    s0_col = station_to_row[s0]
+
+    # Precompute p[i]: index j (1..n) of the last task that finishes <= start_i; 0 if none.
+    # The count of ends <= start_i is exactly that 1-based index.
+    ends = np.fromiter((t["end"] for t in tasks), dtype=np.int64, count=n)
+    starts = np.fromiter((t["start"] for t in tasks), dtype=np.int64, count=n)
+    p = np.zeros(n + 1, dtype=np.int64)  # 1-based
+    p[1:] = np.searchsorted(ends, starts, side="right")
+
+    # DP (1-based for tasks; 0 = empty schedule). For every prefix i it keeps the best
+    # (score, fee) schedule, the last task taken in it, and whether task i was taken.
+    # dp_fee is the total fee INCLUDING return to s0, so tie-breaking is correct locally:
+    # taking i after dp[p[i]] removes the old return slast->s0 and adds slast->si->s0.
+    dp_score, dp_fee, last_idx, choice = wis_dp(p, scores, station_row, s0_col, D, n)
 
     # Reconstruct chosen tasks (indices in 1..n)
     schedule_indices = []
@@ -149,7 +151,7 @@ def solve_princess_diaries(payload):
     schedule_names = [t["name"] for t in selected]
 
     return {
-        "max_score": dp_score[n],
+        "max_score": int(dp_score[n]),
         "min_fee": int(dp_fee[n]),
         "schedule": schedule_names
     }
@@ -157,6 +159,7 @@ def solve_princess_diaries(payload):
 
 # ---------- Flask route ----------
 @app.route("/princess-diaries", methods=["POST"], endpoint="princess_diaries_post")
+@memoize_response(128)
 def princess_diaries_post():
     if not request.is_json:
         return jsonify({"error": "Content-Type must be application/json"}), 415
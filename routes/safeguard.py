@@ -1,9 +1,9 @@
 import re
-import math
-from collections import Counter
-from statistics import median
+from functools import lru_cache
+import numpy as np
 from flask import request, jsonify
 from routes import app  # shared Flask app from routes/__init__.py
+from routes._lru import memoize_response
 
 
 # ----------------------------
@@ -11,12 +11,12 @@ from routes import app  # shared Flask app from routes/__init__.py
 # ----------------------------
 
 VOWELS = set("aeiouAEIOU")
-
-def is_letter(ch):
-    return ("A" <= ch <= "Z") or ("a" <= ch <= "z")
-
-def is_consonant(ch):
-    return is_letter(ch) and ch not in VOWELS
+UPPER = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+LOWER = UPPER.lower()
+ATBASH = str.maketrans(UPPER + LOWER, UPPER[::-1] + LOWER[::-1])
+# A consonant immediately followed by the same consonant
+DOUBLED_CONSONANT = re.compile(
+    "([" + "".join(ch for ch in UPPER + LOWER if ch not in VOWELS) + r"])\1")
 
 def inv_mirror_words(s: str) -> str:
     # self-inverse
@@ -24,70 +24,36 @@ def inv_mirror_words(s: str) -> str:
 
 def inv_encode_mirror_alphabet(s: str) -> str:
     # Atbash (self-inverse)
-    out = []
-    for ch in s:
-        if "A" <= ch <= "Z":
-            out.append(chr(ord('Z') - (ord(ch) - ord('A'))))
-        elif "a" <= ch <= "z":
-            out.append(chr(ord('z') - (ord(ch) - ord('a'))))
-        else:
-            out.append(ch)
-    return "".join(out)
+    return s.translate(ATBASH)
 
 def inv_toggle_case(s: str) -> str:
     # self-inverse
     return s.swapcase()
 
 def inv_swap_pairs(s: str) -> str:
-    # self-inverse; operate per word
+    # self-inverse; operate per word (a trailing odd char stays put)
     def swap_word(w):
-        chars = list(w)
-        out = []
-        i = 0
-        while i < len(chars) - 1:
-            out.append(chars[i + 1])
-            out.append(chars[i])
-            i += 2
-        if i < len(chars):
-            out.append(chars[i])
+        even = len(w) & ~1
+        out = list(w)
+        out[0:even:2] = w[1:even:2]
+        out[1:even:2] = w[0:even:2]
         return "".join(out)
     return " ".join(swap_word(w) for w in s.split(" "))
 
 def inv_encode_index_parity(s: str) -> str:
     # Inverse of: even indices first, then odd indices (0-based), per word
     def inv_word(w):
-        n = len(w)
-        evens_len = (n + 1) // 2
-        evens = list(w[:evens_len])
-        odds = list(w[evens_len:])
-        out = [''] * n
-        ei = 0
-        oi = 0
-        for i in range(n):
-            if i % 2 == 0:
-                out[i] = evens[ei]
-                ei += 1
-            else:
-                out[i] = odds[oi]
-                oi += 1
+        evens_len = (len(w) + 1) // 2
+        out = [""] * len(w)
+        out[0::2] = w[:evens_len]
+        out[1::2] = w[evens_len:]
         return "".join(out)
     return " ".join(inv_word(w) for w in s.split(" "))
 
 def inv_double_consonants(s: str) -> str:
-    # Undo doubling: collapse pairs of identical consonants
-    def inv_word(w):
-        out = []
-        i = 0
-        while i < len(w):
-            ch = w[i]
-            if i + 1 < len(w) and ch == w[i + 1] and is_consonant(ch):
-                out.append(ch)
-                i += 2
-            else:
-                out.append(ch)
-                i += 1
-        return "".join(out)
-    return " ".join(inv_word(w) for w in s.split(" "))
+    # Undo doubling: collapse pairs of identical consonants (spaces never match,
+    # so pairs cannot span words)
+    return DOUBLED_CONSONANT.sub(r"\1", s)
 
 # Map function names to inverse functions
 INVERSES = {
@@ -150,38 +116,31 @@ def solve_challenge_two(coords):
     if len(pts) == 0:
         return 0
 
+    pts = np.asarray(pts, dtype=np.float64)
+
     # Centroid
-    cx = sum(x for x, _ in pts) / len(pts)
-    cy = sum(y for _, y in pts) / len(pts)
-    radii = [math.hypot(x - cx, y - cy) for x, y in pts]
+    radii = np.linalg.norm(pts - pts.mean(axis=0), axis=1)
     if len(radii) >= 3:
-        med = median(radii)
-        mad = median([abs(r - med) for r in radii]) or 1.0
-        keep = []
-        for (p, r) in zip(pts, radii):
-            # threshold 3 * MAD (~robust)
-            if abs(r - med) <= 3 * mad:
-                keep.append(p)
-        pts = keep if len(keep) >= 3 else pts
+        med = np.median(radii)
+        mad = np.median(np.abs(radii - med)) or 1.0
+        # threshold 3 * MAD (~robust)
+        keep = np.abs(radii - med) <= 3 * mad
+        if np.count_nonzero(keep) >= 3:
+            pts = pts[keep]
 
     if len(pts) < 2:
         return 0
 
-    # Pairwise distances
-    dists = []
-    for i in range(len(pts)):
-        x1, y1 = pts[i]
-        for j in range(i + 1, len(pts)):
-            x2, y2 = pts[j]
-            dists.append(round(math.hypot(x2 - x1, y2 - y1), 6))
-
-    if not dists:
-        return 0
+    # Pairwise distances, same (i < j) order as a nested loop
+    i, j = np.triu_indices(len(pts), 1)
+    dists = np.round(np.hypot(pts[j, 0] - pts[i, 0], pts[j, 1] - pts[i, 1]), 6)
 
-    # Bin to find dominant spacing
-    bin_size = max(0.1, (max(dists) - min(dists)) / 50.0)
-    bins = Counter(int(d / bin_size) for d in dists)
-    k, _ = bins.most_common(1)[0]
+    # Bin to find dominant spacing (ties go to the bin seen first, like Counter.most_common)
+    bin_size = max(0.1, (dists.max() - dists.min()) / 50.0)
+    bins = (dists / bin_size).astype(np.int64)
+    lo = bins.min()
+    counts = np.bincount(bins - lo)
+    k = int(bins[np.argmax(counts[bins - lo] == counts.max())])
     dominant = (k + 0.5) * bin_size  # bin center
     # The "simple yet significant" is an integer parameter
     return int(round(dominant))
@@ -199,49 +158,30 @@ def parse_log_entry(s: str):
             out[k.strip().upper()] = v.strip()
     return out
 
+_ROT_TABLES = {}  # n -> str.translate table rotating letters back by n
+
 def rot_n(s: str, n: int):
-    out = []
     n = n % 26
-    for ch in s:
-        if "A" <= ch <= "Z":
-            out.append(chr((ord(ch) - 65 - n) % 26 + 65))
-        elif "a" <= ch <= "z":
-            out.append(chr((ord(ch) - 97 - n) % 26 + 97))
-        else:
-            out.append(ch)
-    return "".join(out)
+    tbl = _ROT_TABLES.get(n)
+    if tbl is None:
+        shifted = UPPER[-n:] + UPPER[:-n] if n else UPPER
+        tbl = _ROT_TABLES[n] = str.maketrans(UPPER + LOWER, shifted + shifted.lower())
+    return s.translate(tbl)
 
 def railfence3_decrypt(ct: str):
-    # Standard 3-rail rail fence decryption
+    # Standard 3-rail rail fence decryption.
+    # The zigzag 0,1,2,1 has period 4: top rail holds positions 0 mod 4,
+    # middle rail every odd position, bottom rail positions 2 mod 4.
     n = len(ct)
-    # pattern indices for zigzag rails
-    pattern = []
-    rail = 0
-    dir = 1
-    for i in range(n):
-        pattern.append(rail)
-        rail += dir
-        if rail == 0 or rail == 2:
-            dir *= 1
-        if rail == 2:
-            dir = -1
-        elif rail == 0:
-            dir = 1
-    # Count chars per rail
-    counts = [pattern.count(0), pattern.count(1), pattern.count(2)]
-    idx = 0
-    rails = []
-    for c in counts:
-        rails.append(list(ct[idx:idx+c]))
-        idx += c
-    # Reconstruct
-    pos = [0, 0, 0]
-    out = []
-    for r in pattern:
-        out.append(rails[r][pos[r]])
-        pos[r] += 1
+    top = (n + 3) // 4
+    mid = n // 2
+    out = [""] * n
+    out[0::4] = ct[:top]
+    out[1::2] = ct[top:top + mid]
+    out[2::4] = ct[top + mid:]
     return "".join(out)
 
+@lru_cache(maxsize=256)
 def build_keyword_alphabet(keyword: str):
     seen = set()
     key_up = []
@@ -254,23 +194,20 @@ def build_keyword_alphabet(keyword: str):
     # cipher alphabet (encryption) = key_up; plaintext = ABC...
     return "".join(key_up)
 
+@lru_cache(maxsize=256)
+def _keyword_trans(keyword: str):
+    # cipher -> plain translate table (both cases) for a keyword alphabet
+    cipher_alpha = build_keyword_alphabet(keyword)
+    plain_alpha = UPPER
+    return str.maketrans(cipher_alpha + cipher_alpha.lower(), plain_alpha + plain_alpha.lower())
+
 def keyword_decrypt(ct: str, keyword: str):
     # monoalphabetic substitution; alphabet built from keyword
-    cipher_alpha = build_keyword_alphabet(keyword)
-    plain_alpha = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
-    inv = {c: p for c, p in zip(cipher_alpha, plain_alpha)}
-    out = []
-    for ch in ct:
-        if "A" <= ch <= "Z":
-            out.append(inv[ch])
-        elif "a" <= ch <= "z":
-            out.append(inv[ch.upper()].lower())
-        else:
-            out.append(ch)
-    return "".join(out)
+    return ct.translate(_keyword_trans(keyword))
 
-def polybius_decrypt(ct: str):
-    # Expect digit pairs (1-5)(1-5), spaces preserved; I/J combined at (2,4)
+def _polybius_table():
+    # Byte lookup indexed by the two-digit number "RC" (row, col in 1..5);
+    # J shares its cell with I, every other pair decodes to "?"
     table = [
         "ABCDE",
         "FGHIJ",  # J shares cell with I
@@ -278,25 +215,25 @@ def polybius_decrypt(ct: str):
         "PQRST",
         "UVWXY",
     ]
-    # Build mapping
-    mp = {}
+    tbl = np.full(100, ord("?"), dtype=np.uint8)
     for r in range(5):
         for c in range(5):
             val = table[r][c]
-            key = f"{r+1}{c+1}"
-            mp[key] = "I" if val in ("I", "J") else val
-    # Extract digit pairs
-    out = []
-    i = 0
-    digits = re.sub(r"[^0-9]", "", ct)
+            tbl[(r + 1) * 10 + (c + 1)] = ord("I" if val in ("I", "J") else val)
+    return tbl
+
+POLYBIUS = _polybius_table()
+NON_DIGITS = re.compile(r"[^0-9]")
+
+def polybius_decrypt(ct: str):
+    # Expect digit pairs (1-5)(1-5), spaces preserved; I/J combined at (2,4)
+    digits = NON_DIGITS.sub("", ct)
     # If no digits, return original
     if len(digits) < 2:
         return ct
-    while i + 1 < len(digits):
-        pair = digits[i:i+2]
-        out.append(mp.get(pair, "?"))
-        i += 2
-    return "".join(out)
+    # Decode all pairs at once (a trailing odd digit is ignored)
+    d = np.frombuffer(digits[:len(digits) & ~1].encode("ascii"), dtype=np.uint8) - ord("0")
+    return POLYBIUS[d[0::2] * 10 + d[1::2]].tobytes().decode("ascii")
 
 def solve_challenge_three(logline: str) -> str:
     fields = parse_log_entry(logline or "")
@@ -324,6 +261,7 @@ def solve_challenge_three(logline: str) -> str:
 # ----------------------------
 # Challenge 4: Final synthesis
 # ----------------------------
+@lru_cache(maxsize=256)
 def strengthen_keyword(base_keyword: str, extra: str) -> str:
     """
     Merge extra recovered string into front of the base keyword (deduped),
@@ -360,6 +298,7 @@ def final_decrypt(ciphertext: str, recovered1: str, recovered_number: int):
 # Flask route
 # ----------------------------
 @app.route("/operation-safeguard", methods=["POST"], endpoint="operation_safeguard_post")
+@memoize_response(128)
 def operation_safeguard_post():
     if not request.is_json:
         return jsonify({"error": "Content-Type must be application/json"}), 415
@@ -1,5 +1,7 @@
+import numpy as np
 from flask import request, jsonify
 from routes import app  # imports the shared Flask app created in routes/__init__.py
+from routes._bridges_nb import find_bridges
 
 
 @app.route("/investigate", methods=["POST"], endpoint="investigate_post")
@@ -9,69 +11,43 @@ def investigate_post():
 
     payload = request.get_json(silent=False) or {}
     networks = payload.get("networks", [])
-    out = {"networks": []}
+    out_networks = []
 
     for item in networks:
         network_id = item.get("networkId")
         edges_in = item.get("network", [])
 
-        # Map spy names to integer ids
+        # Map spy names to integer ids; edges are (u, v) in input order
         id_of = {}
-        names = []
-
-        def gid(name: str) -> int:
-            if name not in id_of:
-                id_of[name] = len(names)
-                names.append(name)
-            return id_of[name]
-
-        edges = []  # list of (u, v) in input order
-        for e in edges_in:
-            u = gid(e["spy1"])
-            v = gid(e["spy2"])
-            edges.append((u, v))
-
-        n = len(names)
-        m = len(edges)
-
-        # Build undirected adjacency with edge indices
-        adj = [[] for _ in range(n)]
-        for ei, (u, v) in enumerate(edges):
-            adj[u].append((v, ei))
-            adj[v].append((u, ei))
+        m = len(edges_in)
+        edges = [None] * m
+        for ei, e in enumerate(edges_in):
+            u = id_of.setdefault(e["spy1"], len(id_of))
+            v = id_of.setdefault(e["spy2"], len(id_of))
+            edges[ei] = (u, v)
+
+        n = len(id_of)
+
+        # Undirected CSR adjacency: each edge appears once from each endpoint
+        uv = np.array(edges, dtype=np.int64).reshape(m, 2)
+        src = np.concatenate((uv[:, 0], uv[:, 1]))
+        order = np.argsort(src, kind="stable")
+        neighbor = np.concatenate((uv[:, 1], uv[:, 0]))[order]
+        edge_id = np.concatenate((np.arange(m), np.arange(m)))[order]
+        indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(src, minlength=n), out=indptr[1:])
 
         # Tarjan bridges: edges with low[v] > tin[u] are bridges; others are cycle edges.
-        timer = 0
-        tin = [-1] * n
-        low = [0] * n
-        bridges = [False] * m
-
-        def dfs(u: int, parent_edge: int = -1):
-            nonlocal timer
-            tin[u] = low[u] = timer
-            timer += 1
-            for v, ei in adj[u]:
-                if ei == parent_edge:
-                    continue
-                if tin[v] != -1:
-                    # back edge
-                    low[u] = min(low[u], tin[v])
-                else:
-                    dfs(v, ei)
-                    low[u] = min(low[u], low[v])
-                    if low[v] > tin[u]:
-                        bridges[ei] = True
-
-        for u in range(n):
-            if tin[u] == -1:
-                dfs(u)
+        bridges = find_bridges(indptr, neighbor, edge_id, n, m)
 
         # Extra channels = edges that are NOT bridges (i.e., in at least one cycle)
-        extra = [edges_in[ei] for ei in range(m) if not bridges[ei]]
+        extra = [edges_in[ei] for ei in np.flatnonzero(~bridges).tolist()]
 
-        out["networks"].append({
+        out_networks.append({
             "networkId": network_id,
             "extraChannels": extra
         })
 
-    return jsonify(out)
+    # Encode straight to bytes (no str round trip through jsonify)
+    body = app.json.dumps_bytes({"networks": out_networks})
+    return app.response_class(body, mimetype="application/json")
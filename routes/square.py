@@ -1,4 +1,3 @@
-import json
 import logging
 
 from flask import request, jsonify
@@ -7,9 +6,12 @@ from routes import app
 
 logger = logging.getLogger(__name__)
 
+# Static usage message for GET, serialized once at import
+_USAGE_BODY = app.json.dumps({"usage": "POST JSON like { \"input\": 5 } to this endpoint."})
+
 @app.route('/square', methods=['GET', 'POST'])
 def evaluate():
     if request.method == 'GET':
-        return jsonify({"usage": "POST JSON like { \"input\": 5 } to this endpoint."})
+        return app.response_class(_USAGE_BODY, mimetype="application/json")
     data = request.get_json()
     return jsonify(data["input"] * data["input"])
@@ -1,26 +1,32 @@
-from math import sqrt, ceil
+from math import sqrt
+import numpy as np
 from flask import request, jsonify
 from routes import app  # uses the shared app from routes/__init__.py
+from routes._lru import memoize_response
 
+SQRT2 = sqrt(2.0)
 
-def latency_points(customer_xy, center_xy):
+
+def latency_points(customer_xy, centers_xy):
     """
-    Award up to 30 points based on Euclidean distance.
+    Award up to 30 points per concert based on Euclidean distance
+    from the customer to each booking center (centers_xy is a (k, 2) array).
     Tiers chosen to match the example:
       d <= 1*sqrt(2)  -> 30
       d <= 2*sqrt(2)  -> 20
       d <= 3*sqrt(2)  -> 10
       else            -> 0
     """
-    dx = customer_xy[0] - center_xy[0]
-    dy = customer_xy[1] - center_xy[1]
-    d = sqrt(dx * dx + dy * dy)
-    step = ceil(d / sqrt(2.0))  # 1,2,3,...
+    dx = customer_xy[0] - centers_xy[:, 0]
+    dy = customer_xy[1] - centers_xy[:, 1]
+    d = np.sqrt(dx * dx + dy * dy)
+    step = np.ceil(d / SQRT2).astype(np.int64)  # 1,2,3,...
     pts = 30 - 10 * (step - 1)
-    return max(0, pts)
+    return np.maximum(0, pts)
 
 
 @app.route("/ticketing-agent", methods=["POST"], endpoint="ticketing_agent_post")
+@memoize_response(128)
 def ticketing_agent_post():
     if not request.is_json:
         return jsonify({"error": "Content-Type must be application/json"}), 415
@@ -31,11 +37,11 @@ def ticketing_agent_post():
     priority = data.get("priority", {})  # {credit_card: concert_name}
 
     # Precompute concert info, preserving input order (for tie-breaks)
-    concert_info = []
-    for c in concerts:
-        name = c["name"]
-        bx, by = c["booking_center_location"]
-        concert_info.append((name, (int(bx), int(by))))
+    concert_names = [c["name"] for c in concerts]
+    centers_xy = np.array(
+        [[int(bx), int(by)] for bx, by in (c["booking_center_location"] for c in concerts)],
+        dtype=np.float64,
+    ).reshape(-1, 2)
 
     result = {}
 
@@ -45,28 +51,25 @@ def ticketing_agent_post():
         cx, cy = cust["location"]
         card = cust["credit_card"]
 
-        base = 100 if vip else 0
-        best_tuple = None  # (score, latency_pts, -index, concert_name)
-
-        for idx, (concert_name, center_xy) in enumerate(concert_info):
-            score = base
-
-            # +50 if this customer's card has priority for THIS concert
-            if priority.get(card) == concert_name:
-                score += 50
+        if not concert_names:
+            result[cname] = None
+            continue
 
-            # 0..30 latency bonus (closer -> higher)
-            lp = latency_points((int(cx), int(cy)), center_xy)
-            score += lp
+        # 0..30 latency bonus per concert (closer -> higher)
+        lp = latency_points((int(cx), int(cy)), centers_xy)
 
-            # Tie-breakers:
-            # 1) higher score
-            # 2) if tie, higher latency points (closer)
-            # 3) if tie, earlier in input order
-            key = (score, lp, -idx, concert_name)
-            if best_tuple is None or key > best_tuple:
-                best_tuple = key
+        # +100 for VIPs, +50 if this customer's card has priority for that concert
+        # (scalar == per name, so a list-valued priority never broadcasts)
+        prio = priority.get(card)
+        prio_mask = np.fromiter((name == prio for name in concert_names), dtype=bool,
+                                count=len(concert_names))
+        score = (100 if vip else 0) + 50 * prio_mask + lp
 
-        result[cname] = best_tuple[3] if best_tuple else None
+        # Tie-breakers:
+        # 1) higher score
+        # 2) if tie, higher latency points (closer); lp <= 40 so it fits below score
+        # 3) if tie, earlier in input order (argmax returns the first maximum)
+        best = int(np.argmax(score * 64 + lp))
+        result[cname] = concert_names[best]
 
     return jsonify(result)
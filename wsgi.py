@@ -0,0 +1,4 @@
+from app import app
+
+# WSGI entry point: gunicorn wsgi:application (settings in gunicorn.conf.py)
+application = app